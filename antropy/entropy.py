@@ -1,12 +1,13 @@
 """Entropy functions"""
 
 import numpy as np
-from numba import jit, types
+from numba import jit, prange, types
 from math import factorial, log
 from sklearn.neighbors import KDTree
 from scipy.signal import periodogram, welch
+from scipy.spatial import cKDTree
 
-from .utils import _embed, _xlogx
+from .utils import _check_embed_params, _embed, _embed_view, _shannon, _shannon_counts
 
 all = [
     "perm_entropy",
@@ -20,13 +21,96 @@ all = [
 ]
 
 
-def perm_entropy(x, order=3, delay=1, normalize=False):
+@jit(
+    types.void(
+        types.Array(types.float64, 1, "C", readonly=True),
+        types.int64,
+        types.int64,
+        types.Array(types.int64, 1, "C"),
+    ),
+    nopython=True,
+    parallel=True,
+    cache=True,
+)
+def _perm_hashes(x, order, delay, out):
+    """Lehmer code of the ordinal pattern of each embedded vector of x.
+
+    The code of a window is computed from the pairwise comparisons of its
+    values, without building the embedded matrix. Ties are ranked by order
+    of appearance. Codes are in [0, order!).
+    """
+    for i in prange(out.size):
+        h = 0
+        for a in range(order):
+            xa = x[i + a * delay]
+            rank = 0
+            for b in range(a + 1, order):
+                if x[i + b * delay] < xa:
+                    rank += 1
+            h = h * (order - a) + rank
+        out[i] = h
+
+
+# Signature of the unrolled _perm_hashes kernels for a fixed order
+_perm_hashes_fixed_sig = types.void(
+    types.Array(types.float64, 1, "C", readonly=True),
+    types.int64,
+    types.Array(types.int64, 1, "C"),
+)
+
+
+@jit(_perm_hashes_fixed_sig, nopython=True, parallel=True, cache=True)
+def _perm_hashes_3(x, delay, out):
+    """Unrolled :py:func:`_perm_hashes` for order 3."""
+    for i in prange(out.size):
+        a = x[i]
+        b = x[i + delay]
+        c = x[i + 2 * delay]
+        r0 = (b < a) + (c < a)
+        r1 = c < b
+        out[i] = r0 * 2 + r1
+
+
+@jit(_perm_hashes_fixed_sig, nopython=True, parallel=True, cache=True)
+def _perm_hashes_4(x, delay, out):
+    """Unrolled :py:func:`_perm_hashes` for order 4."""
+    for i in prange(out.size):
+        a = x[i]
+        b = x[i + delay]
+        c = x[i + 2 * delay]
+        d = x[i + 3 * delay]
+        r0 = (b < a) + (c < a) + (d < a)
+        r1 = (c < b) + (d < b)
+        r2 = d < c
+        out[i] = (r0 * 3 + r1) * 2 + r2
+
+
+@jit(_perm_hashes_fixed_sig, nopython=True, parallel=True, cache=True)
+def _perm_hashes_5(x, delay, out):
+    """Unrolled :py:func:`_perm_hashes` for order 5."""
+    for i in prange(out.size):
+        a = x[i]
+        b = x[i + delay]
+        c = x[i + 2 * delay]
+        d = x[i + 3 * delay]
+        e = x[i + 4 * delay]
+        r0 = (b < a) + (c < a) + (d < a) + (e < a)
+        r1 = (c < b) + (d < b) + (e < b)
+        r2 = (d < c) + (e < c)
+        r3 = e < d
+        out[i] = ((r0 * 4 + r1) * 3 + r2) * 2 + r3
+
+
+_perm_hashes_unrolled = {3: _perm_hashes_3, 4: _perm_hashes_4, 5: _perm_hashes_5}
+
+
+def perm_entropy(x, order=3, delay=1, normalize=False, axis=-1):
     """Permutation Entropy.
 
     Parameters
     ----------
     x : list or np.array
-        One-dimensional time series of shape (n_times)
+        1D or N-D data.
     order : int
         Order of permutation entropy. Default is 3.
     delay : int, list, np.ndarray or range
@@ -36,10 +120,14 @@ def perm_entropy(x, order=3, delay=1, normalize=False):
     normalize : bool
         If True, divide by log2(order!) to normalize the entropy between 0
         and 1. Otherwise, return the permutation entropy in bit.
+    axis : int
+        The axis along which the entropy is calculated. Default is -1 (last).
+
+        .. versionadded:: 0.1.7
 
     Returns
     -------
-    pe : float
+    pe : float or np.array
         Permutation Entropy.
 
     Notes
@@ -67,6 +155,12 @@ def perm_entropy(x, order=3, delay=1, normalize=False):
 
     .. math:: Y=[y(1),y(2),...,y(N-(\\text{order}-1))*\\text{delay})]^T
 
+    Tied values within a vector :math:`y(i)` are ranked by order of
+    appearance, i.e. the earlier value is considered the smaller one. Note
+    that before version 0.1.7, ties were ranked with a non-stable sort, so
+    that the permutation entropy of time series with tied values (e.g.
+    integer-valued data) may differ slightly from older versions.
+
     References
     ----------
     Bandt, Christoph, and Bernd Pompe. "Permutation entropy: a
@@ -120,30 +214,58 @@ def perm_entropy(x, order=3, delay=1, normalize=False):
 
     >>> x = np.arange(1000)
     >>> print(f"{ant.perm_entropy(x, normalize=True):.4f}")
-    -0.0000
+    0.0000
+
+    Normalized permutation entropy of 2D data (random, sine and linear)
+
+    >>> rng = np.random.default_rng(seed=42)
+    >>> t = np.arange(1000)
+    >>> x = np.vstack((rng.random(1000), np.sin(2 * np.pi * t / 100), t))
+    >>> np.round(ant.perm_entropy(x, normalize=True), 4)
+    array([0.9997, 0.4472, 0.    ])
     """
     # If multiple delay are passed, return the average across all d
     if isinstance(delay, (list, np.ndarray, range)):
-        return np.mean([perm_entropy(x, order=order, delay=d, normalize=normalize) for d in delay])
-    x = np.array(x)
-    ran_order = range(order)
-    hashmult = np.power(order, ran_order)
-    assert delay > 0, "delay must be greater than zero."
-    # Embed x and sort the order of permutations
-    sorted_idx = _embed(x, order=order, delay=delay).argsort(kind="quicksort")
-    # Associate unique integer to each permutations
-    hashval = (np.multiply(sorted_idx, hashmult)).sum(1)
-    # Return the counts
-    _, c = np.unique(hashval, return_counts=True)
-    # Use np.true_divide for Python 2 compatibility
-    p = np.true_divide(c, c.sum())
-    pe = -_xlogx(p).sum()
+        return np.mean(
+            [perm_entropy(x, order=order, delay=d, normalize=normalize, axis=axis) for d in delay],
+            axis=0,
+        )
+    x = np.moveaxis(np.asarray(x, dtype=np.float64), axis, -1)
+    N = x.shape[-1]
+    _check_embed_params(N, order, delay)
+    # Associate unique integer to each permutations. All the time series are
+    # processed at once as a single flat array, and the codes of the windows
+    # that straddle two time series are discarded.
+    rows = np.ascontiguousarray(x.reshape(-1, N))
+    n_rows, n_emb = rows.shape[0], N - (order - 1) * delay
+    hashval = np.empty(rows.size, dtype=np.int64)
+    if order in _perm_hashes_unrolled:
+        _perm_hashes_unrolled[order](rows.ravel(), delay, hashval[: hashval.size - N + n_emb])
+    else:
+        _perm_hashes(rows.ravel(), order, delay, hashval[: hashval.size - N + n_emb])
+    hashval = hashval.reshape(n_rows, N)[:, :n_emb]
+    # Return the counts. The hash values are bounded by order!, so when there
+    # are fewer possible patterns than embedded vectors (i.e. for the usual
+    # small orders), a histogram is cheaper than np.unique. Offsetting the
+    # codes of each time series gives all histograms in one bincount, which
+    # is no bigger than the data.
+    n_codes = factorial(order)
+    if n_codes <= n_emb:
+        hashval += n_codes * np.arange(n_rows)[:, None]
+        c = np.bincount(hashval.ravel(), minlength=n_rows * n_codes)
+        c = c.reshape(n_rows, n_codes)
+    else:
+        c = [np.unique(h, return_counts=True)[1] for h in hashval]
+    pe = np.array([_shannon_counts(ci.astype(np.int64, copy=False)) for ci in c])
+    pe = pe.reshape(x.shape[:-1])[()]
     if normalize:
         pe /= np.log2(factorial(order))
     return pe
 
 
-def spectral_entropy(x, sf, method="fft", nperseg=None, normalize=False, axis=-1):
+def spectral_entropy(
+    x, sf, method="fft", nperseg=None, normalize=False, axis=-1, detrend="constant"
+):
     """Spectral Entropy.
 
     Parameters
@@ -165,6 +287,16 @@ def spectral_entropy(x, sf, method="fft", nperseg=None, normalize=False, axis=-1
         between 0 and 1. Otherwise, return the spectral entropy in bit.
     axis : int
         The axis along which the entropy is calculated. Default is -1 (last).
+    detrend : str, function or False
+        Detrending applied to the data (``'fft'``) or to each segment
+        (``'welch'``) before computing the PSD, passed to the scipy function.
+        Default is ``'constant'`` (remove the mean). Setting
+        ``detrend=False`` skips this pass over the data, which is faster on
+        long recordings. If the data is already centered, this only affects
+        the lowest frequency bins (with ``'welch'``, the window spreads the
+        mean of each segment over the first bins).
+
+        .. versionadded:: 0.1.7
 
     Returns
     -------
@@ -209,12 +341,12 @@ def spectral_entropy(x, sf, method="fft", nperseg=None, normalize=False, axis=-1
     >>> np.random.seed(42)
     >>> x = np.random.rand(3000)
     >>> ant.spectral_entropy(x, sf=100, method='welch')
-    6.98004566237139
+    6.980045662371391
 
     Normalized spectral entropy
 
     >>> ant.spectral_entropy(x, sf=100, method='welch', normalize=True)
-    0.9955526198316073
+    0.9955526198316075
 
     Normalized spectral entropy of 2D data
 
@@ -246,25 +378,32 @@ def spectral_entropy(x, sf, method="fft", nperseg=None, normalize=False, axis=-1
     0.9248
     """
     x = np.asarray(x)
-    # Compute and normalize power spectrum
+    # Compute power spectrum
     if method == "fft":
-        _, psd = periodogram(x, sf, axis=axis)
+        _, psd = periodogram(x, sf, detrend=detrend, axis=axis)
     elif method == "welch":
-        _, psd = welch(x, sf, nperseg=nperseg, axis=axis)
-    psd_norm = psd / psd.sum(axis=axis, keepdims=True)
-    se = -_xlogx(psd_norm).sum(axis=axis)
+        _, psd = welch(x, sf, nperseg=nperseg, detrend=detrend, axis=axis)
+    # The PSD is normalized on the fly by _shannon
+    psd = np.moveaxis(psd, axis, -1)
+    n_freqs = psd.shape[-1]
+    rows = np.ascontiguousarray(psd.reshape(-1, n_freqs), dtype=np.float64)
+    se = np.array([_shannon(row) for row in rows]).reshape(psd.shape[:-1])[()]
     if normalize:
-        se /= np.log2(psd_norm.shape[axis])
+        se /= np.log2(n_freqs)
     return se
 
 
-def svd_entropy(x, order=3, delay=1, normalize=False):
+# Relative threshold below which the Gram eigenvalues are not trusted
+_SQRT_EPS = np.sqrt(np.finfo(np.float64).eps)
+
+
+def svd_entropy(x, order=3, delay=1, normalize=False, axis=-1):
     """Singular Value Decomposition entropy.
 
     Parameters
     ----------
     x : list or np.array
-        One-dimensional time series of shape (n_times)
+        1D or N-D data.
     order : int
         Order of SVD entropy (= length of the embedding dimension).
         Default is 3.
@@ -273,10 +412,14 @@ def svd_entropy(x, order=3, delay=1, normalize=False):
     normalize : bool
         If True, divide by log2(order!) to normalize the entropy between 0
         and 1. Otherwise, return the permutation entropy in bit.
+    axis : int
+        The axis along which the entropy is calculated. Default is -1 (last).
+
+        .. versionadded:: 0.1.7
 
     Returns
     -------
-    svd_e : float
+    svd_e : float or np.array
         SVD Entropy
 
     Notes
@@ -312,14 +455,14 @@ def svd_entropy(x, order=3, delay=1, normalize=False):
     >>> x = [4, 7, 9, 10, 6, 11, 3]
     >>> # Return a value in bit between 0 and log2(factorial(order))
     >>> print(ant.svd_entropy(x, order=2))
-    0.7618909465130066
+    0.7618909465130068
 
     Normalized SVD entropy with order 3
 
     >>> x = [4, 7, 9, 10, 6, 11, 3]
     >>> # Return a value comprised between 0 and 1.
     >>> print(ant.svd_entropy(x, order=3, normalize=True))
-    0.6870083043946692
+    0.687008304394669
 
     Fractional Gaussian noise with H = 0.5
 
@@ -359,20 +502,148 @@ def svd_entropy(x, order=3, delay=1, normalize=False):
     >>> x = np.arange(1000)
     >>> print(f"{ant.svd_entropy(x, normalize=True):.4f}")
     0.0053
+
+    Normalized SVD entropy of 2D data (random, sine and linear)
+
+    >>> rng = np.random.default_rng(seed=42)
+    >>> t = np.arange(1000)
+    >>> x = np.vstack((rng.random(1000), np.sin(2 * np.pi * t / 100), t))
+    >>> np.round(ant.svd_entropy(x, normalize=True), 4)
+    array([0.8527, 0.1773, 0.0053])
     """
-    x = np.array(x)
-    mat = _embed(x, order=order, delay=delay)
-    W = np.linalg.svd(mat, compute_uv=False)
-    # Normalize the singular values
-    W /= sum(W)
-    svd_e = -_xlogx(W).sum()
+    x = np.moveaxis(np.asarray(x, dtype=np.float64), axis, -1)
+    mat = _embed_view(x.reshape(-1, x.shape[-1]), order=order, delay=delay)
+    # The singular values of mat are the square roots of the eigenvalues of
+    # the (order, order) Gram matrix, which is much cheaper than an SVD of the
+    # (n_times, order) embedded matrix.
+    W = np.linalg.eigvalsh(np.einsum("...ki,...kj->...ij", mat, mat))
+    # Squaring the matrix loses the singular values smaller than about
+    # sqrt(eps) times the largest one, e.g. with a large DC offset. Use an SVD
+    # of the embedded matrix for these (rare) time series.
+    lossy = W[:, 0] < _SQRT_EPS * W[:, -1]
+    W = np.sqrt(np.maximum(W, 0))
+    for k in np.flatnonzero(lossy):
+        W[k] = np.linalg.svd(mat[k], compute_uv=False)
+    # The singular values are normalized on the fly by _shannon
+    svd_e = np.array([_shannon(w) for w in W]).reshape(x.shape[:-1])[()]
     if normalize:
         svd_e /= np.log2(order)
     return svd_e
 
 
+# Distance metrics supported by _numba_count_within
+_numba_metrics = {
+    "chebyshev": 0,
+    "infinity": 0,
+    "euclidean": 1,
+    "l2": 1,
+    "manhattan": 2,
+    "cityblock": 2,
+    "l1": 2,
+}
+
+# Minkowski p-norm of the metrics counted with scipy's cKDTree
+_ckdtree_p = {
+    "euclidean": 2,
+    "l2": 2,
+    "manhattan": 1,
+    "cityblock": 1,
+    "l1": 1,
+}
+
+
+@jit(
+    types.UniTuple(types.float64[:], 2)(
+        types.Array(types.float64, 1, "C", readonly=True),
+        types.int64,
+        types.int64,
+        types.float64,
+        types.int64,
+    ),
+    nopython=True,
+    parallel=True,
+    cache=True,
+)
+def _numba_count_within(x, order, n_emb1, r, metric_id):
+    """Number of neighbours within r of each embedded vector of x.
+
+    Returns the counts for the first n_emb1 vectors of length order, and for
+    the vectors of length order + 1. The vectors are sorted by their first
+    value, so that only those whose first value is within r are compared.
+    The distance is the Chebyshev (metric_id=0), Euclidean (1) or Manhattan
+    (2) distance.
+    """
+    n_emb2 = x.size - order
+    sorted_idx = np.argsort(x[:n_emb1], kind="mergesort")
+    # Embedded vectors of length order + 1, in sorted order. The last value of
+    # the vectors that cannot be extended is infinite, which never matches.
+    emb = np.empty((n_emb1, order + 1))
+    for ii in range(n_emb1):
+        i = sorted_idx[ii]
+        for k in range(order):
+            emb[ii, k] = x[i + k]
+        emb[ii, order] = x[i + order] if i < n_emb2 else np.inf
+    lower = np.searchsorted(emb[:, 0], emb[:, 0] - r, side="left")
+    upper = np.searchsorted(emb[:, 0], emb[:, 0] + r, side="right")
+    # Compare the squared distance for the Euclidean metric
+    radius = r * r if metric_id == 1 else r
+
+    count1 = np.zeros(n_emb1)
+    count2 = np.zeros(n_emb1)
+    for ii in prange(n_emb1):
+        n_match1 = 0
+        n_match2 = 0
+        for jj in range(lower[ii], upper[ii]):
+            dist = 0.0
+            for k in range(order):
+                diff = abs(emb[ii, k] - emb[jj, k])
+                if metric_id == 0:
+                    dist = max(dist, diff)
+                elif metric_id == 1:
+                    dist += diff * diff
+                else:
+                    dist += diff
+                if dist > radius:
+                    break
+            if dist > radius:
+                continue
+            n_match1 += 1
+            diff = abs(emb[ii, order] - emb[jj, order])
+            if metric_id == 0:
+                dist = max(dist, diff)
+            elif metric_id == 1:
+                dist += diff * diff
+            else:
+                dist += diff
+            n_match2 += dist <= radius
+        count1[sorted_idx[ii]] = n_match1
+        count2[sorted_idx[ii]] = n_match2
+    return count1, count2[:n_emb2]
+
+
+def _check_app_samp_input(x):
+    """Return x as a contiguous float64 1D array, checking that it is finite.
+
+    The Numba kernels do not validate their input, unlike the KDTrees.
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    if x.ndim != 1:
+        raise ValueError("x must be a 1D array, got an array of shape %s." % (x.shape,))
+    if not np.isfinite(x).all():
+        raise ValueError("Input contains NaN or infinity.")
+    return x
+
+
 def _app_samp_entropy(x, order, r, metric="chebyshev", approximate=True):
-    """Utility function for `app_entropy`` and `sample_entropy`."""
+    """Utility function for `app_entropy`` and `sample_entropy`.
+
+    For time-series shorter than 10000 samples and the Chebyshev, Euclidean
+    or Manhattan distance, the neighbours are counted with a Numba kernel.
+    For longer time-series, the Euclidean and Manhattan neighbours are
+    counted with :py:class:`scipy.spatial.cKDTree`, which is faster than
+    scikit-learn for these metrics, and the other metrics with
+    :py:class:`sklearn.neighbors.KDTree`.
+    """
     _all_metrics = KDTree.valid_metrics
     _all_metrics = _all_metrics() if callable(_all_metrics) else _all_metrics
     if metric not in _all_metrics:
@@ -381,74 +652,90 @@ def _app_samp_entropy(x, order, r, metric="chebyshev", approximate=True):
             "metric names are: %s" % (metric, _all_metrics)
         )
     phi = np.zeros(2)
-
-    # compute phi(order, r)
-    _emb_data1 = _embed(x, order, 1)
-    if approximate:
-        emb_data1 = _emb_data1
+    x = _check_app_samp_input(x)
+    # Number of embedded vectors of length order and order + 1
+    n_emb1 = x.size - order + 1 if approximate else x.size - order
+    n_emb2 = x.size - order
+
+    if metric in _numba_metrics and x.size < 10000:
+        count1, count2 = _numba_count_within(x, order, n_emb1, r, _numba_metrics[metric])
+    elif metric in _ckdtree_p:
+        p = _ckdtree_p[metric]
+        emb_data1 = _embed(x, order, 1)[:n_emb1]
+        count1 = (
+            cKDTree(emb_data1)
+            .query_ball_point(emb_data1, r, p=p, return_length=True, workers=-1)
+            .astype(np.float64)
+        )
+        emb_data2 = _embed(x, order + 1, 1)
+        count2 = (
+            cKDTree(emb_data2)
+            .query_ball_point(emb_data2, r, p=p, return_length=True, workers=-1)
+            .astype(np.float64)
+        )
     else:
-        emb_data1 = _emb_data1[:-1]
-    count1 = (
-        KDTree(emb_data1, metric=metric)
-        .query_radius(emb_data1, r, count_only=True)
-        .astype(np.float64)
-    )
-    # compute phi(order + 1, r)
-    emb_data2 = _embed(x, order + 1, 1)
-    count2 = (
-        KDTree(emb_data2, metric=metric)
-        .query_radius(emb_data2, r, count_only=True)
-        .astype(np.float64)
-    )
+        # compute phi(order, r)
+        emb_data1 = _embed(x, order, 1)[:n_emb1]
+        count1 = (
+            KDTree(emb_data1, metric=metric)
+            .query_radius(emb_data1, r, count_only=True)
+            .astype(np.float64)
+        )
+        # compute phi(order + 1, r)
+        emb_data2 = _embed(x, order + 1, 1)
+        count2 = (
+            KDTree(emb_data2, metric=metric)
+            .query_radius(emb_data2, r, count_only=True)
+            .astype(np.float64)
+        )
     if approximate:
-        phi[0] = np.mean(np.log(count1 / emb_data1.shape[0]))
-        phi[1] = np.mean(np.log(count2 / emb_data2.shape[0]))
+        phi[0] = np.mean(np.log(count1 / n_emb1))
+        phi[1] = np.mean(np.log(count2 / n_emb2))
     else:
-        phi[0] = np.mean((count1 - 1) / (emb_data1.shape[0] - 1))
-        phi[1] = np.mean((count2 - 1) / (emb_data2.shape[0] - 1))
+        phi[0] = np.mean((count1 - 1) / (n_emb1 - 1))
+        phi[1] = np.mean((count2 - 1) / (n_emb2 - 1))
     return phi
 
 
 @jit(
     (types.Array(types.float64, 1, "C", readonly=True), types.int32, types.float64),
     nopython=True,
+    parallel=True,
+    cache=True,
+    fastmath=True,
 )
 def _numba_sampen(sequence, order, r):
     """
     Fast evaluation of the sample entropy using Numba.
-    """
 
-    size = sequence.size
-    # sequence = sequence.tolist()
+    The templates are sorted by their first value, so that for each template
+    only the following ones whose first value is within r have to be scanned.
+    Matches of length order and order + 1 are counted in the same pass, and
+    the templates are distributed across threads.
+    """
+    n_templates = sequence.size - order
+    sorted_idx = np.argsort(sequence[:n_templates], kind="mergesort")
+    # Embedded templates of length order + 1, in sorted order
+    emb = np.empty((n_templates, order + 1))
+    for i in prange(n_templates):
+        for k in range(order + 1):
+            emb[i, k] = sequence[sorted_idx[i] + k]
 
     numerator = 0
     denominator = 0
 
-    for offset in range(1, size - order):
-        n_numerator = int(abs(sequence[order] - sequence[order + offset]) >= r)
-        n_denominator = 0
-
-        for idx in range(order):
-            n_numerator += abs(sequence[idx] - sequence[idx + offset]) >= r
-            n_denominator += abs(sequence[idx] - sequence[idx + offset]) >= r
-
-        if n_numerator == 0:
-            numerator += 1
-        if n_denominator == 0:
-            denominator += 1
-
-        prev_in_diff = int(abs(sequence[order] - sequence[offset + order]) >= r)
-        for idx in range(1, size - offset - order):
-            out_diff = int(abs(sequence[idx - 1] - sequence[idx + offset - 1]) >= r)
-            in_diff = int(abs(sequence[idx + order] - sequence[idx + offset + order]) >= r)
-            n_numerator += in_diff - out_diff
-            n_denominator += prev_in_diff - out_diff
-            prev_in_diff = in_diff
-
-            if n_numerator == 0:
-                numerator += 1
-            if n_denominator == 0:
+    for i in prange(n_templates):
+        for j in range(i + 1, n_templates):
+            if emb[j, 0] - emb[i, 0] >= r:
+                break
+            match = True
+            for k in range(1, order):
+                if abs(emb[j, k] - emb[i, k]) >= r:
+                    match = False
+                    break
+            if match:
                 denominator += 1
+                numerator += abs(emb[j, order] - emb[i, order]) < r
 
     if denominator == 0:
         return 0  # use 0/0 == 0
@@ -602,10 +889,9 @@ def sample_entropy(x, order=2, tolerance=None, metric="chebyshev"):
     vectors of length :math:`m` having a Chebyshev distance inferior to
     :math:`r`.
 
-    Note that if ``metric == 'chebyshev'`` and ``len(x) < 5000`` points,
-    then the sample entropy is computed using a fast custom Numba script.
-    For other distance metric or longer time-series, the sample entropy is
-    computed using a code from the
+    Note that if ``metric == 'chebyshev'``, the sample entropy is computed
+    using a fast custom Numba script. For other distance metrics, the sample
+    entropy is computed using a code from the
     `mne-features <https://mne.tools/mne-features/>`_ package by Jean-Baptiste
     Schiratti and Alexandre Gramfort (requires sklearn).
 
@@ -672,15 +958,21 @@ def sample_entropy(x, order=2, tolerance=None, metric="chebyshev"):
     else:
         assert isinstance(tolerance, (float, int))
         r = tolerance
-    x = np.asarray(x, dtype=np.float64)
-    if metric == "chebyshev" and x.size < 5000:
-        return _numba_sampen(x, order=order, r=r)
+    if metric == "chebyshev":
+        return _numba_sampen(_check_app_samp_input(x), order=order, r=r)
     else:
         phi = _app_samp_entropy(x, order=order, r=r, metric=metric, approximate=False)
         return -np.log(np.divide(phi[1], phi[0]))
 
 
-@jit("uint32(uint32[:])", nopython=True)
+@jit(
+    [
+        types.uint32(types.Array(types.uint8, 1, "C", readonly=True)),
+        types.uint32(types.Array(types.uint32, 1, "C", readonly=True)),
+    ],
+    nopython=True,
+    cache=True,
+)
 def _lz_complexity(binary_string):
     """Internal Numba implementation of the Lempel-Ziv (LZ) complexity.
     https://github.com/Naereen/Lempel-Ziv_Complexity/blob/master/src/lziv_complexity.py
@@ -694,9 +986,13 @@ def _lz_complexity(binary_string):
     len_substring = 1
     max_len_substring = 1
     pointer = 0
+    n = len(binary_string)
 
-    # Iterate until the entire string has not been parsed
-    while prefix_len + len_substring <= len(binary_string):
+    # Iterate until the entire string has not been parsed. Note that matches
+    # are compared one character at a time on purpose: most of them are only
+    # a few characters long, and block-wise comparisons were measured to be
+    # slower on random and sparse binary sequences.
+    while prefix_len + len_substring <= n:
         # Given a prefix length, find the largest substring
         if (
             binary_string[pointer + len_substring - 1]
@@ -810,17 +1106,22 @@ def lziv_complexity(sequence, normalize=False):
     assert isinstance(normalize, bool)
     if isinstance(sequence, (list, np.ndarray)):
         sequence = np.asarray(sequence)
-        if sequence.dtype.kind in "bfi":
-            # Convert [True, False] or [1., 0.] to [1, 0]
-            s = sequence.astype("uint32")
+        if sequence.dtype.kind == "b" or sequence.dtype == np.uint8:
+            # Booleans and bytes are passed as a contiguous uint8 buffer
+            s = np.ascontiguousarray(sequence).view(np.uint8)
+        elif sequence.dtype.kind in "fiu":
+            # Convert [1., 0.] to [1, 0]
+            s = np.ascontiguousarray(sequence, dtype=np.uint32)
         else:
             # Treat as numpy array of strings
-            # Map string characters to utf-8 integer representation
-            s = np.fromiter(map(ord, "".join(sequence.astype(str))), dtype="uint32")
-            # Can't preallocate length (by specifying count) due to string
-            # concatenation
-    else:
-        s = np.fromiter(map(ord, sequence), dtype="uint32")
+            sequence = "".join(sequence.astype(str))
+    if isinstance(sequence, str):
+        # Map string characters to their unicode code points, without going
+        # through Python integers
+        if sequence.isascii():
+            s = np.frombuffer(sequence.encode("ascii"), dtype=np.uint8)
+        else:
+            s = np.frombuffer(sequence.encode("utf-32-le"), dtype=np.uint32)
 
     if normalize:
         # 1) Timmermann et al. 2019
@@ -835,7 +1136,7 @@ def lziv_complexity(sequence, normalize=False):
         # return _lz_complexity(s) / _lz_complexity(s_shuffled)
         # 2) Zhang et al. 2009
         n = len(s)
-        base = sum(np.bincount(s) > 0)  # Number of unique characters
+        base = np.count_nonzero(np.bincount(s))  # Number of unique characters
         base = 2 if base < 2 else base
         return _lz_complexity(s) / (n / log(n, base))
     else:
@@ -2,6 +2,7 @@
 
 import unittest
 import numpy as np
+from scipy.signal import periodogram, welch
 from numpy.testing import assert_equal
 from numpy import apply_along_axis as aal
 from antropy import (
@@ -15,7 +16,13 @@ from antropy import (
     hjorth_params,
 )
 
-from antropy.utils import _xlogx
+from antropy.entropy import (
+    _app_samp_entropy,
+    _numba_count_within,
+    _perm_hashes,
+    _perm_hashes_unrolled,
+)
+from antropy.utils import _embed, _embed_view, _xlogx, _shannon, _shannon_counts
 
 from utils import RANDOM_TS, NORMAL_TS, RANDOM_TS_LONG, PURE_SINE, ARANGE, TEST_DTYPES
 
@@ -35,13 +42,38 @@ class TestEntropy(unittest.TestCase):
         self.assertEqual(np.round(perm_entropy(BANDT_PERM, order=2), 3), 0.918)
         self.assertEqual(np.round(perm_entropy(BANDT_PERM, order=3), 3), 1.522)
 
+        # Ties are ranked by order of appearance
+        assert perm_entropy(np.ones(100), order=3) == 0
+        # Unrolled kernels give the same codes as the generic one
+        x = np.round(NORMAL_TS, 1)  # with ties
+        for order, kernel in _perm_hashes_unrolled.items():
+            expected = np.empty(x.size - 2 * (order - 1), dtype=np.int64)
+            hashval = np.empty_like(expected)
+            _perm_hashes(x, order, 2, expected)
+            kernel(x, 2, hashval)
+            assert_equal(hashval, expected)
+        # Large order (hash values no longer fit a small histogram)
+        assert 0 < perm_entropy(RANDOM_TS, order=8, normalize=True) <= 1
         # Average of multiple delays
         assert isinstance(perm_entropy(RANDOM_TS, order=3, delay=[1, 2, 3]), float)
+        # 2D data
+        for order, delay in [(3, 1), (4, [1, 2]), (9, 2)]:
+            params = dict(order=order, delay=delay, normalize=True)
+            assert_equal(
+                aal(perm_entropy, axis=1, arr=data, **params), perm_entropy(data, **params)
+            )
+            assert_equal(perm_entropy(data, **params), perm_entropy(data.T, axis=0, **params))
+        # Many short time series, with more possible patterns than embedded
+        # vectors: the histograms must not grow with n_rows * order!
+        x = np.random.default_rng(42).random((5000, 50))
+        assert_equal(perm_entropy(x, order=8), aal(perm_entropy, 1, x, order=8))
         # Error
         with self.assertRaises(ValueError):
             perm_entropy(BANDT_PERM, order=4, delay=3)
         with self.assertRaises(ValueError):
             perm_entropy(BANDT_PERM, order=3, delay=0.5)
+        with self.assertRaises(ValueError):
+            perm_entropy(BANDT_PERM, order=3, delay=0)
         with self.assertRaises(ValueError):
             perm_entropy(BANDT_PERM, order=1, delay=1)
 
@@ -49,6 +81,15 @@ class TestEntropy(unittest.TestCase):
         spectral_entropy(RANDOM_TS, SF_TS, method="fft")
         spectral_entropy(RANDOM_TS, SF_TS, method="welch")
         spectral_entropy(RANDOM_TS, SF_TS, method="welch", nperseg=400)
+        # detrend is passed to scipy: compare with the PSD of a signal with a
+        # large DC offset, which is dominated by the zero-frequency bin
+        x = NORMAL_TS + 100
+        for method, psd_func in [("fft", periodogram), ("welch", welch)]:
+            psd = psd_func(x, SF_TS, detrend=False)[1]
+            psd /= psd.sum()
+            se = spectral_entropy(x, SF_TS, method=method, detrend=False)
+            self.assertAlmostEqual(se, -_xlogx(psd).sum())
+            self.assertGreater(spectral_entropy(x, SF_TS, method=method) - se, 1)
         self.assertEqual(np.round(spectral_entropy(RANDOM_TS, SF_TS, normalize=True), 1), 0.9)
         self.assertEqual(np.round(spectral_entropy(PURE_SINE, 100), 2), 0.0)
         # 2D data
@@ -60,13 +101,38 @@ class TestEntropy(unittest.TestCase):
 
     def test_svd_entropy(self):
         svd_entropy(RANDOM_TS, order=3, delay=1, normalize=False)
+        # Compare with the SVD of the embedded matrix
+        W = np.linalg.svd(_embed(RANDOM_TS, order=4, delay=2), compute_uv=False)
+        W /= W.sum()
+        self.assertAlmostEqual(svd_entropy(RANDOM_TS, order=4, delay=2), -_xlogx(W).sum())
+        # Large DC offset: the Gram matrix loses the small singular values
+        x = NORMAL_TS + 1e8
+        W = np.linalg.svd(_embed(x, order=4, delay=1), compute_uv=False)
+        W /= W.sum()
+        np.testing.assert_allclose(svd_entropy(x, order=4), -_xlogx(W).sum(), rtol=1e-6)
+        x = np.vstack((NORMAL_TS, NORMAL_TS + 1e8))
+        np.testing.assert_allclose(svd_entropy(x, order=4), aal(svd_entropy, 1, x, order=4))
         svd_entropy(RANDOM_TS, order=3, delay=1, normalize=True)
         svd_entropy(RANDOM_TS, order=2, delay=1, normalize=False)
         svd_entropy(RANDOM_TS, order=3, delay=2, normalize=False)
+        # 2D data
+        params = dict(order=4, delay=2, normalize=True)
+        assert_equal(aal(svd_entropy, axis=1, arr=data, **params), svd_entropy(data, **params))
+        assert_equal(svd_entropy(data, **params), svd_entropy(data.T, axis=0, **params))
 
     def test_sample_entropy(self):
         se = sample_entropy(RANDOM_TS, order=2)
-        sample_entropy(RANDOM_TS_LONG, order=2)
+        # Numba implementation matches the KDTree one on long time-series
+        se_long = sample_entropy(RANDOM_TS_LONG, order=2)
+        r = 0.2 * np.std(RANDOM_TS_LONG)
+        phi = _app_samp_entropy(RANDOM_TS_LONG, order=2, r=r, approximate=False)
+        self.assertAlmostEqual(se_long, -np.log(phi[1] / phi[0]))
+        # cKDTree (euclidean) matches the scikit-learn KDTree (minkowski, p=2)
+        x = np.random.default_rng(42).random(12000)
+        assert_equal(
+            _app_samp_entropy(x, order=2, r=0.05, metric="euclidean"),
+            _app_samp_entropy(x, order=2, r=0.05, metric="minkowski"),
+        )
         se_eu_3 = sample_entropy(RANDOM_TS, order=3, metric="euclidean")
         # Compare with MNE-features
         # Note that MNE-features uses the sample standard deviation
@@ -87,9 +153,31 @@ class TestEntropy(unittest.TestCase):
         self.assertEqual(np.round(ae, 3), 2.076)
         self.assertEqual(np.round(ae_eu_3, 3), 0.956)
         app_entropy(RANDOM_TS, order=3)
+        # Long and strongly autocorrelated time-series (random walk), for which
+        # each embedded vector has many neighbours: KDTree matches Numba kernel
+        x = np.cumsum(np.random.default_rng(42).standard_normal(12000))
+        r = 0.2 * np.std(x)
+        count1, count2 = _numba_count_within(x, 2, x.size - 1, r, 0)
+        phi = _app_samp_entropy(x, order=2, r=r)
+        self.assertAlmostEqual(phi[0], np.mean(np.log(count1 / (x.size - 1))))
+        self.assertAlmostEqual(phi[1], np.mean(np.log(count2 / (x.size - 2))))
+        self.assertAlmostEqual(app_entropy(x, order=2), phi[0] - phi[1])
         with self.assertRaises(ValueError):
             app_entropy(RANDOM_TS, order=2, metric="wrong")
 
+    def test_app_samp_entropy_invalid_input(self):
+        # NaN, infinity and N-D input raise whatever the length and metric
+        for n in [100, 12000]:
+            x_nan = np.random.default_rng(42).random(n)
+            x_nan[5] = np.nan
+            x_inf = x_nan.copy()
+            x_inf[5] = np.inf
+            for func in [app_entropy, sample_entropy]:
+                for metric in ["chebyshev", "euclidean", "minkowski"]:
+                    for x in [x_nan, x_inf, x_nan[:100].reshape(2, 50)]:
+                        with self.assertRaises(ValueError):
+                            func(x, order=2, tolerance=0.2, metric=metric)
+
     def test_lziv_complexity(self):
         """Compare to:
         https://www.mathworks.com/matlabcentral/fileexchange/38211-calc_lz_complexity
@@ -119,6 +207,7 @@ class TestEntropy(unittest.TestCase):
         assert lziv_complexity(s + s) == 27
         assert lziv_complexity(s + s, normalize=True) < 1.0
         assert lziv_complexity("HELLO WORLD!")
+        assert lziv_complexity("ÀÉÀÉÀÉ") == lziv_complexity("010101")
         s = ["A"] * 10000
         assert lziv_complexity(s) == 2
         assert lziv_complexity(s, normalize=True) < 0.01
@@ -162,6 +251,8 @@ class TestEntropy(unittest.TestCase):
                 x = RANDOM_TS.astype(dtype)
                 x.flags.writeable = False
                 func(x)
+                # Non-contiguous input
+                func(RANDOM_TS.astype(dtype)[::2])
 
     def test_xlogx_handles_zero(self):
         assert_equal(_xlogx(0), 0)
@@ -187,3 +278,24 @@ class TestEntropy(unittest.TestCase):
         np.testing.assert_allclose(
             _xlogx(np.array([0, 1, 3, 9, -1]), base=3), np.array([0, 0, 3, 18, np.nan])
         )
+
+    def test_shannon(self):
+        p = np.array([0, 0.25, 0.25, 0.5])
+        self.assertAlmostEqual(_shannon(p), -_xlogx(p).sum())
+        self.assertAlmostEqual(_shannon(10 * p), -_xlogx(p).sum())
+        assert _shannon(np.array([3.0, 0.0])) == 0
+        assert _shannon(np.zeros(3)) == 0
+
+    def test_shannon_counts(self):
+        c = np.array([0, 1, 1, 2])
+        self.assertAlmostEqual(_shannon_counts(c), _shannon(c.astype(float)))
+        assert _shannon_counts(np.array([0, 7, 0])) == 0
+        assert _shannon_counts(np.array([0, 5000, 0])) == 0
+        # Counts on both sides of the log2 lookup table
+        c = np.array([3, 1024, 1025, 40000])
+        self.assertAlmostEqual(_shannon_counts(c), _shannon(c.astype(float)))
+
+    def test_embed_view(self):
+        for order, delay in [(2, 1), (3, 1), (4, 3)]:
+            assert_equal(_embed_view(RANDOM_TS, order, delay), _embed(RANDOM_TS, order, delay))
+            assert_equal(_embed_view(data, order, delay), _embed(data, order, delay))
@@ -2,12 +2,42 @@
 
 import numpy as np
 from numba import jit
+from numpy.lib.stride_tricks import as_strided
 from math import log, floor
 
-all = ["_embed", "_linear_regression", "_log_n", "_xlog2x"]
+all = [
+    "_check_embed_params",
+    "_embed",
+    "_embed_view",
+    "_linear_regression",
+    "_log_n",
+    "_xlog2x",
+    "_shannon",
+    "_shannon_counts",
+]
 epsilon = 10e-9
 
 
+def _check_embed_params(n_times, order, delay):
+    """Check the order and delay of a time-delay embedding.
+
+    Parameters
+    ----------
+    n_times : int
+        Length of the time series.
+    order : int
+        Embedding dimension (order).
+    delay : int
+        Delay.
+    """
+    if order * delay > n_times:
+        raise ValueError("Error: order * delay should be lower than x.size")
+    if delay < 1:
+        raise ValueError("Delay has to be at least 1.")
+    if order < 2:
+        raise ValueError("Order has to be at least 2.")
+
+
 def _embed(x, order=3, delay=1):
     """Time-delay embedding.
 
@@ -28,12 +58,7 @@ def _embed(x, order=3, delay=1):
     x = np.asarray(x)
     N = x.shape[-1]
     assert x.ndim in [1, 2], "Only 1D or 2D arrays are currently supported."
-    if order * delay > N:
-        raise ValueError("Error: order * delay should be lower than x.size")
-    if delay < 1:
-        raise ValueError("Delay has to be at least 1.")
-    if order < 2:
-        raise ValueError("Order has to be at least 2.")
+    _check_embed_params(N, order, delay)
 
     if x.ndim == 1:
         # 1D array (n_times)
@@ -59,7 +84,41 @@ def _embed(x, order=3, delay=1):
         return Y
 
 
-@jit("UniTuple(float64, 2)(float64[:], float64[:])", nopython=True)
+def _embed_view(x, order=3, delay=1):
+    """Time-delay embedding, as a read-only strided view of x.
+
+    Same as :py:func:`_embed`, but without copying x.
+
+    Parameters
+    ----------
+    x : array_like
+        1D-array of shape (n_times) or 2D-array of shape (signal_indice, n_times)
+    order : int
+        Embedding dimension (order).
+    delay : int
+        Delay.
+
+    Returns
+    -------
+    embedded : array_like
+        Embedded time series, of shape (..., n_times - (order - 1) * delay, order)
+    """
+    x = np.asarray(x)
+    N = x.shape[-1]
+    assert x.ndim in [1, 2], "Only 1D or 2D arrays are currently supported."
+    _check_embed_params(N, order, delay)
+
+    shape = x.shape[:-1] + (N - (order - 1) * delay, order)
+    strides = x.strides[:-1] + (x.strides[-1], delay * x.strides[-1])
+    if not x.flags.c_contiguous:
+        return as_strided(x, shape=shape, strides=strides, writeable=False)
+    # Same as as_strided, with a fraction of its overhead on short time series
+    Y = np.ndarray(shape, dtype=x.dtype, buffer=x, strides=strides)
+    Y.flags.writeable = False
+    return Y
+
+
+@jit("UniTuple(float64, 2)(float64[:], float64[:])", nopython=True, cache=True)
 def _linear_regression(x, y):
     """Fast linear regression using Numba.
 
@@ -92,7 +151,7 @@ def _linear_regression(x, y):
     return slope, intercept
 
 
-@jit("i8[:](f8, f8, f8)", nopython=True)
+@jit("i8[:](f8, f8, f8)", nopython=True, cache=True)
 def _log_n(min_n, max_n, factor):
     """
     Creates a list of integer values by successively multiplying a minimum
@@ -138,3 +197,53 @@ def _xlogx(x, base=2):
     valid = x > 0
     xlogx[valid] = x[valid] * np.log(x[valid]) / np.log(base)
     return xlogx
+
+
+@jit("f8(f8[::1])", nopython=True, cache=True, fastmath=True)
+def _shannon(w):
+    """Shannon entropy (in bits) of the distribution proportional to w.
+
+    Computed in a single pass as (S log2(S) - sum(w * log2(w))) / S, with S
+    the sum of the weights, so that w does not have to be normalized first.
+    Non-positive weights contribute 0, and the entropy of an all-zero w is 0.
+    """
+    total = 0.0
+    s = 0.0
+    for i in range(w.size):
+        wi = w[i]
+        if wi > 0.0:
+            total += wi
+            s += wi * np.log2(wi)
+    if total == 0.0:
+        return 0.0
+    # Clip the rounding errors of a (near) one-hot distribution
+    return max((total * np.log2(total) - s) / total, 0.0)
+
+
+# log2(1), ..., log2(1024), frozen into _shannon_counts at compile time
+_LOG2_LUT = np.log2(np.arange(1, 1025, dtype=np.float64))
+
+
+@jit("f8(i8)", nopython=True, cache=True)
+def _log2_count(n):
+    """log2 of a positive count, read from _LOG2_LUT when n <= 1024."""
+    if n <= _LOG2_LUT.size:
+        return _LOG2_LUT[n - 1]
+    return np.log2(n)
+
+
+@jit("f8(i8[::1])", nopython=True, cache=True)
+def _shannon_counts(c):
+    """Shannon entropy (in bits) of the distribution given by counts.
+
+    Computed as (T log2(T) - sum(c * log2(c))) / T, with T the total count, so
+    that the probabilities are never materialized. Zero counts contribute 0.
+    """
+    total = 0
+    s = 0.0
+    for i in range(c.size):
+        ci = c[i]
+        if ci > 0:
+            total += ci
+            s += ci * _log2_count(ci)
+    return (total * _log2_count(total) - s) / total